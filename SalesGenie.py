@@ -4,6 +4,7 @@ import streamlit as st
 from crystal_service import CrystalService
 from agents.crystal_agent import CrystalAgent
 from agents.personality_chat_agent import PersonalityChatAgent
+from stream_helpers import stream_to_placeholder
 from swarm import Swarm
 import json
 import pathlib
@@ -14,15 +15,18 @@ import altair as alt
 # Load environment variables
 load_dotenv()
 
-# Initialize Swarm client
-client = Swarm()
+# Initialize the Swarm client, Crystal service and agents once per process;
+# Streamlit reruns this script on every interaction. No spinner: this runs before
+# st.set_page_config, which must be the first element
+@st.cache_resource(show_spinner=False)
+def create_services():
+    client = Swarm()
+    crystal_service = CrystalService()
+    crystal_agent = CrystalAgent(client)
+    chat_agent = PersonalityChatAgent(client)
+    return client, crystal_service, crystal_agent, chat_agent
 
-# Initialize Crystal service and agent
-crystal_service = CrystalService()
-crystal_agent = CrystalAgent(client)
-
-# Add after other agent initializations
-chat_agent = PersonalityChatAgent(client)
+client, crystal_service, crystal_agent, chat_agent = create_services()
 
 # Create profiles directory if it doesn't exist
 PROFILES_DIR = pathlib.Path("profiles")
@@ -31,6 +35,67 @@ PROFILES_DIR.mkdir(exist_ok=True)
 # At the top of the file, after initializing services
 DEFAULT_PURPOSE = "communication"  # Add default purpose
 
+# Sample chat questions: category -> {short label: full question}
+QUESTION_CATEGORIES = {
+    "Select a sample question...": "",
+    "Negotiation Strategy": {
+        "What concessions might appeal?": "What concessions or compromises might appeal to this personality type?",
+        "Likely walkaway point?": "What's their likely walkaway point or bottom line based on their traits?",
+        "ROI discussion approach?": "How should I frame the ROI discussion given their decision-making style?"
+    },
+    "Communication Approach": {
+        "Key resonating phrases?": "What key phrases would resonate with their communication style?",
+        "Trust building strategy?": "How can I build trust quickly with this personality type?",
+        "Communication mistakes to avoid?": "What communication style mistakes should I avoid?"
+    },
+    "Meeting & Process": {
+        "Optimal meeting format?": "What meeting format would they prefer?",
+        "Timeline for negotiations?": "What's the optimal timeline for concluding negotiations?",
+        "Pricing discussion approach?": "When and how should I discuss pricing?"
+    },
+    "Objection Handling": {
+        "Likely objections?": "What are likely objections based on their behavioral traits?",
+        "Required proof points?": "What validation or proof points would they value most?",
+        "Handling resistance?": "How do I overcome resistance while maintaining rapport?"
+    },
+    "Closing Strategy": {
+        "Best closing approach?": "What closing approach would be most effective?",
+        "Ready to move signs?": "How do I know when they're ready to move forward?",
+        "Follow-up strategy?": "What follow-up cadence would work best?"
+    }
+}
+
+# Sidebar profile sections: display name -> internal section name
+SECTION_OPTIONS = {
+    "🧠 Personality DNA": "Behavioral Traits",
+    "💡 Communication Blueprint": "Communication Style",
+    "🎯 Success Strategies": "Strategic Tips",
+    "🤝 Meeting Mastery": "Meeting Approach",
+    "💰 Deal Dynamics": "Negotiation Style",
+    "📊 Engagement Roadmap": "Content Strategy",
+    "💼 Sales Playbook": "Sales Approach",
+    "🎯 Product Demo": "Product Demo",
+    "💰 Pricing Talk": "Pricing",
+    "🤝 Trust Building": "Building Trust",
+    "⚡ Action Drivers": "Driving Action",
+    "👥 Working Style": "Working Together",
+    "📝 First Impressions": "First Impressions",
+    "📞 Follow-up Guide": "Following Up"
+}
+
+# Card-style sections: section -> (title, phrase keys, card class, icon, icon class)
+CARD_SECTIONS = {
+    "Meeting Approach": ("Meeting Approach", ("meeting",), "timeline-item", "→", "timeline-marker"),
+    "Content Strategy": ("Content Strategy", ("communication",), "strategy-card", "📋", "strategy-icon"),
+    "Sales Approach": ("Sales Playbook", ("selling",), "sales-card", "💼", "sales-icon"),
+    "Product Demo": ("Product Presentation Guide", ("product_demo",), "demo-card", "🎯", "demo-icon"),
+    "Pricing": ("Pricing Strategy", ("pricing",), "pricing-card", "💰", "pricing-icon"),
+    "Building Trust": ("Trust Building Approach", ("building_trust",), "trust-card", "🤝", "trust-icon"),
+    "Working Together": ("Working Style", ("working_together",), "collab-card", "👥", "collab-icon"),
+    "Following Up": ("Follow-up Strategy", ("following_up",), "followup-card", "📞", "followup-icon"),
+    "First Impressions": ("First Impressions", ("first_impression", "first_impressions"), "impression-card", "👋", "impression-icon"),
+}
+
 # Function to save profile
 def save_profile(profile_data: dict) -> str:
     """Save profile to disk and return filename"""
@@ -406,11 +471,6 @@ def display_profile_content(data: dict, section: str):
                 </div>
             """, unsafe_allow_html=True)
     
-    elif section == "Meeting Approach":
-        st.markdown("## Meeting Approach")
-        points = get_phrases('meeting')
-        display_cards(points, "timeline-item", "→", "timeline-marker")
-    
     elif section == "Negotiation Style":
         st.markdown("## Negotiation Style")
         points = get_phrases('negotiating')
@@ -423,48 +483,16 @@ def display_profile_content(data: dict, section: str):
                     </div>
                 """, unsafe_allow_html=True)
     
-    elif section == "Content Strategy":
-        st.markdown("## Content Strategy")
-        points = get_phrases('communication')
-        display_cards(points, "strategy-card", "📋", "strategy-icon")
-    
-    # Additional sections using the helper functions
-    elif section == "Sales Approach":
-        st.markdown("## Sales Playbook")
-        points = get_phrases('selling')
-        display_cards(points, "sales-card", "💼", "sales-icon")
-    
-    elif section == "Product Demo":
-        st.markdown("## Product Presentation Guide")
-        points = get_phrases('product_demo')
-        display_cards(points, "demo-card", "🎯", "demo-icon")
-    
-    elif section == "Pricing":
-        st.markdown("## Pricing Strategy")
-        points = get_phrases('pricing')
-        display_cards(points, "pricing-card", "💰", "pricing-icon")
-    
-    elif section == "Building Trust":
-        st.markdown("## Trust Building Approach")
-        points = get_phrases('building_trust')
-        display_cards(points, "trust-card", "🤝", "trust-icon")
-    
-    elif section == "Working Together":
-        st.markdown("## Working Style")
-        points = get_phrases('working_together')
-        display_cards(points, "collab-card", "👥", "collab-icon")
-    
-    elif section == "Following Up":
-        st.markdown("## Follow-up Strategy")
-        points = get_phrases('following_up')
-        display_cards(points, "followup-card", "📞", "followup-icon")
-    
-    elif section == "First Impressions":
-        st.markdown("## First Impressions")
-        points = get_phrases('first_impression')
-        if not points:
-            points = get_phrases('first_impressions')
-        display_cards(points, "impression-card", "👋", "impression-icon")
+    elif section in CARD_SECTIONS:
+        title, phrase_keys, card_class, icon, icon_class = CARD_SECTIONS[section]
+        st.markdown(f"## {title}")
+        # Use the first phrase key that has data (some profiles use alternate keys)
+        points = []
+        for key in phrase_keys:
+            points = get_phrases(key)
+            if points:
+                break
+        display_cards(points, card_class, icon, icon_class)
 
 def display_profile_sidebar(data: dict):
     """Common function to display profile sidebar"""
@@ -518,34 +546,16 @@ def display_profile_sidebar(data: dict):
         # Navigation Section
         st.markdown("### 🎯 Engagement Insights")
         
-        # Section options with clear naming
-        section_options = {
-            "🧠 Personality DNA": "Behavioral Traits",
-            "💡 Communication Blueprint": "Communication Style",
-            "🎯 Success Strategies": "Strategic Tips",
-            "🤝 Meeting Mastery": "Meeting Approach",
-            "💰 Deal Dynamics": "Negotiation Style",
-            "📊 Engagement Roadmap": "Content Strategy",
-            "💼 Sales Playbook": "Sales Approach",
-            "🎯 Product Demo": "Product Demo",
-            "💰 Pricing Talk": "Pricing",
-            "🤝 Trust Building": "Building Trust",
-            "⚡ Action Drivers": "Driving Action",
-            "👥 Working Style": "Working Together",
-            "📝 First Impressions": "First Impressions",
-            "📞 Follow-up Guide": "Following Up"
-        }
-        
         # Radio button for section selection
         section = st.radio(
             label="Profile Sections",
-            options=list(section_options.keys()),
+            options=list(SECTION_OPTIONS.keys()),
             key="section_selector",
             format_func=lambda x: x,
             label_visibility="collapsed"
         )
         
-        return section_options[section]
+        return SECTION_OPTIONS[section]
 
 # Main content area - for new analysis
 if selected_profile == "New Analysis":
@@ -583,47 +593,17 @@ if selected_profile == "New Analysis":
                     with chat_tab:
                         st.info(f"💬 Have a conversation with {data.get('first_name', '')} based on their personality profile")
                         
-                        # Sample questions dropdown
-                        question_categories = {
-                            "Select a sample question...": "",
-                            "Negotiation Strategy": {
-                                "What concessions might appeal?": "What concessions or compromises might appeal to this personality type?",
-                                "Likely walkaway point?": "What's their likely walkaway point or bottom line based on their traits?",
-                                "ROI discussion approach?": "How should I frame the ROI discussion given their decision-making style?"
-                            },
-                            "Communication Approach": {
-                                "Key resonating phrases?": "What key phrases would resonate with their communication style?",
-                                "Trust building strategy?": "How can I build trust quickly with this personality type?",
-                                "Communication mistakes to avoid?": "What communication style mistakes should I avoid?"
-                            },
-                            "Meeting & Process": {
-                                "Optimal meeting format?": "What meeting format would they prefer?",
-                                "Timeline for negotiations?": "What's the optimal timeline for concluding negotiations?",
-                                "Pricing discussion approach?": "When and how should I discuss pricing?"
-                            },
-                            "Objection Handling": {
-                                "Likely objections?": "What are likely objections based on their behavioral traits?",
-                                "Required proof points?": "What validation or proof points would they value most?",
-                                "Handling resistance?": "How do I overcome resistance while maintaining rapport?"
-                            },
-                            "Closing Strategy": {
-                                "Best closing approach?": "What closing approach would be most effective?",
-                                "Ready to move signs?": "How do I know when they're ready to move forward?",
-                                "Follow-up strategy?": "What follow-up cadence would work best?"
-                            }
-                        }
-                        
                         # Two-level selectbox for categories and questions
                         selected_category = st.selectbox(
                             "Question Category:",
-                            options=list(question_categories.keys()),
+                            options=list(QUESTION_CATEGORIES.keys()),
                             key="category_selector"
                         )
                         
-                        if selected_category != "Select a sample question..." and selected_category in question_categories:
+                        if selected_category != "Select a sample question..." and selected_category in QUESTION_CATEGORIES:
                             selected_question = st.selectbox(
                                 "Sample Question:",
-                                options=list(question_categories[selected_category].keys()),
+                                options=list(QUESTION_CATEGORIES[selected_category].keys()),
                                 key="question_selector"
                             )
                             
@@ -631,7 +611,7 @@ if selected_profile == "New Analysis":
                                 # Auto-fill the text area with the selected question
                                 user_message = st.text_area(
                                     "Your message:",
-                                    value=question_categories[selected_category][selected_question],
+                                    value=QUESTION_CATEGORIES[selected_category][selected_question],
                                     placeholder="Type your message here...",
                                     key="chat_input"
                                 )
@@ -660,7 +640,6 @@ if selected_profile == "New Analysis":
                                 
                                 # Create a placeholder for the streaming response
                                 response_placeholder = st.empty()
-                                current_response = []
 
                                 with st.spinner(f"Getting response from {data.get('first_name', '')}..."):
                                     # Generate response using personality chat agent
@@ -671,20 +650,9 @@ if selected_profile == "New Analysis":
                                     )
                                     
                                     # Stream the response
-                                    for chunk in response_stream:
-                                        if isinstance(chunk, dict) and "content" in chunk:
-                                            content = chunk["content"]
-                                            if content is not None:
-                                                current_response.append(content)
-                                                # Update the response in real-time
-                                                response_placeholder.markdown(f"🧞‍♂️ {data.get('first_name', '')}: {''.join(current_response)}")
-                                        elif isinstance(chunk, str) and chunk is not None:
-                                            current_response.append(chunk)
-                                            # Update the response in real-time
-                                            response_placeholder.markdown(f"🧞‍♂️ {data.get('first_name', '')}: {''.join(current_response)}")
-                                    
-                                    # Get the complete response
-                                    response = "".join(current_response)
+                                    response = stream_to_placeholder(
+                                        response_stream, response_placeholder, prefix=f"🧞‍♂️ {data.get('first_name', '')}: "
+                                    )
                                     
                                     # Add response to history
                                     st.session_state.chat_history.append({"role": "assistant", "content": response})
@@ -715,47 +683,17 @@ else:
     with chat_tab:
         st.info(f"💬 Have a conversation with {data.get('first_name', '')} based on their personality profile")
         
-        # Sample questions dropdown
-        question_categories = {
-            "Select a sample question...": "",
-            "Negotiation Strategy": {
-                "What concessions might appeal?": "What concessions or compromises might appeal to this personality type?",
-                "Likely walkaway point?": "What's their likely walkaway point or bottom line based on their traits?",
-                "ROI discussion approach?": "How should I frame the ROI discussion given their decision-making style?"
-            },
-            "Communication Approach": {
-                "Key resonating phrases?": "What key phrases would resonate with their communication style?",
-                "Trust building strategy?": "How can I build trust quickly with this personality type?",
-                "Communication mistakes to avoid?": "What communication style mistakes should I avoid?"
-            },
-            "Meeting & Process": {
-                "Optimal meeting format?": "What meeting format would they prefer?",
-                "Timeline for negotiations?": "What's the optimal timeline for concluding negotiations?",
-                "Pricing discussion approach?": "When and how should I discuss pricing?"
-            },
-            "Objection Handling": {
-                "Likely objections?": "What are likely objections based on their behavioral traits?",
-                "Required proof points?": "What validation or proof points would they value most?",
-                "Handling resistance?": "How do I overcome resistance while maintaining rapport?"
-            },
-            "Closing Strategy": {
-                "Best closing approach?": "What closing approach would be most effective?",
-                "Ready to move signs?": "How do I know when they're ready to move forward?",
-                "Follow-up strategy?": "What follow-up cadence would work best?"
-            }
-        }
-        
         # Two-level selectbox for categories and questions
         selected_category = st.selectbox(
             "Question Category:",
-            options=list(question_categories.keys()),
+            options=list(QUESTION_CATEGORIES.keys()),
             key="category_selector"
         )
         
-        if selected_category != "Select a sample question..." and selected_category in question_categories:
+        if selected_category != "Select a sample question..." and selected_category in QUESTION_CATEGORIES:
             selected_question = st.selectbox(
                 "Sample Question:",
-                options=list(question_categories[selected_category].keys()),
+                options=list(QUESTION_CATEGORIES[selected_category].keys()),
                 key="question_selector"
             )
             
@@ -763,7 +701,7 @@ else:
                 # Auto-fill the text area with the selected question
                 user_message = st.text_area(
                     "Your message:",
-                    value=question_categories[selected_category][selected_question],
+                    value=QUESTION_CATEGORIES[selected_category][selected_question],
                     placeholder="Type your message here...",
                     key="chat_input"
                 )
@@ -792,7 +730,6 @@ else:
                 
                 # Create a placeholder for the streaming response
                 response_placeholder = st.empty()
-                current_response = []
 
                 with st.spinner(f"Getting response from {data.get('first_name', '')}..."):
                     # Generate response using personality chat agent
@@ -803,20 +740,9 @@ else:
                     )
                     
                     # Stream the response
-                    for chunk in response_stream:
-                        if isinstance(chunk, dict) and "content" in chunk:
-                            content = chunk["content"]
-                            if content is not None:
-                                current_response.append(content)
-                                # Update the response in real-time
-                                response_placeholder.markdown(f"🧞‍♂️ {data.get('first_name', '')}: {''.join(current_response)}")
-                        elif isinstance(chunk, str) and chunk is not None:
-                            current_response.append(chunk)
-                            # Update the response in real-time
-                            response_placeholder.markdown(f"🧞‍♂️ {data.get('first_name', '')}: {''.join(current_response)}")
-                    
-                    # Get the complete response
-                    response = "".join(current_response)
+                    response = stream_to_placeholder(
+                        response_stream, response_placeholder, prefix=f"🧞‍♂️ {data.get('first_name', '')}: "
+                    )
                     
                     # Add response to history
                     st.session_state.chat_history.append({"role": "assistant", "content": response})
@@ -832,26 +758,9 @@ def get_available_sections(data: dict) -> dict:
     def has_data(key):
         return bool(content.get(key, {}).get('phrase', []))
     
-    all_sections = {
-        "🧠 Personality DNA": "Behavioral Traits",
-        "💡 Communication Blueprint": "Communication Style",
-        "🎯 Success Strategies": "Strategic Tips",
-        "🤝 Meeting Mastery": "Meeting Approach",
-        "💰 Deal Dynamics": "Negotiation Style",
-        "📊 Engagement Roadmap": "Content Strategy",
-        "💼 Sales Playbook": "Sales Approach",
-        "🎯 Product Demo": "Product Demo",
-        "💰 Pricing Talk": "Pricing",
-        "🤝 Trust Building": "Building Trust",
-        "⚡ Action Drivers": "Driving Action",
-        "👥 Working Style": "Working Together",
-        "📝 First Impressions": "First Impressions",
-        "📞 Follow-up Guide": "Following Up"
-    }
-    
     # Filter sections based on data availability
     available_sections = {}
-    for display_name, internal_name in all_sections.items():
+    for display_name, internal_name in SECTION_OPTIONS.items():
         section_key = internal_name.lower().replace(' ', '_')
         if has_data(section_key) or internal_name in ["Behavioral Traits", "Communication Style"]:
             available_sections[display_name] = internal_name
@@ -91,10 +91,7 @@ CODE_REVIEWER_INSTRUCTIONS = """You are a senior software engineer specializing
        - Performance optimizations
     """
 
-NFR_ANALYSIS_PROMPT_TEMPLATE = """Original NFR Document Content:
-{nfr_content}
-
-Analyze these Non-Functional Requirements for a {app_type}. 
+NFR_ANALYSIS_PROMPT_TEMPLATE = """Analyze the Non-Functional Requirements document at the end of this message.
 Structure your analysis as follows:
 
 1. NFR CATEGORIES IDENTIFICATION
@@ -120,7 +117,12 @@ For each identified category, provide:
    - Impact on development process
    - Resource requirements per category
 
-Format the response in a clear, categorical structure that can be easily referenced in subsequent analyses."""
+Format the response in a clear, categorical structure that can be easily referenced in subsequent analyses.
+
+Application Type: {app_type}
+
+Original NFR Document Content:
+{nfr_content}"""
 
 JIRA_AGENT_INSTRUCTIONS = """You are a Jira integration specialist responsible for creating well-structured Jira tickets. 
 You MUST respond with ONLY valid JSON in the exact format specified below.
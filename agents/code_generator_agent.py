@@ -1,5 +1,6 @@
 """Code Generator Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run
 from typing import Generator, Optional
 
 class CodeGeneratorAgent:
@@ -63,14 +64,8 @@ class CodeGeneratorAgent:
             Generator for the code stream
         """
         nfr_section = f"\nNon-Functional Requirements:\n{nfr_analysis}" if nfr_analysis else ""
+        # Static guidance first so the prompt prefix is identical across runs
         code_prompt = f"""
-        Based on the specifications, generate code in {programming_language}.
-        Application Type: {app_type}
-        
-        Final Requirements:
-        {final_requirements}
-        {nfr_section}
-        
         If Web Application:
         - Include frontend code (HTML/CSS if needed)
         - Include necessary routing
@@ -80,12 +75,19 @@ class CodeGeneratorAgent:
         - Focus on API endpoints
         - Include request/response handling
         - Include data models
+        
+        Based on the specifications below, generate code in {programming_language}.
+        Application Type: {app_type}
+        
+        Final Requirements:
+        {final_requirements}
+        {nfr_section}
         """
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": code_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": code_prompt}]
         )
 
     def get_agent(self):
@@ -1,5 +1,6 @@
 """Code Reviewer Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run
 from typing import Generator
 
 class CodeReviewerAgent:
@@ -118,10 +119,10 @@ class CodeReviewerAgent:
         Test Cases: {test_cases}
         """
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": review_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": review_prompt}]
         )
 
     def get_agent(self):
@@ -1,38 +1,56 @@
 """Diagram Generator Agent"""
 from swarm import Agent, Swarm
-from typing import Generator, Optional, Dict
+from response_cache import cached_run, store_response
+from diagram_renderer import DIAGRAM_FILENAME
+from typing import Generator, Optional, Dict, Tuple
 import json
+import re
+import threading
+from collections import OrderedDict
+
+# Import statements returned by the model, optionally wrapped in quotes
+_QUOTE_RE = re.compile(r"^['\"](.*)['\"]$")
+_DIAGRAM_IMPORT = "from diagrams import Diagram, Cluster, Edge"
+# Most generated diagrams kept per agent, least recently used evicted first
+_DIAGRAM_CACHE_SIZE = 64
+# Top-level keys the model's JSON must define
+_REQUIRED_KEYS = ("imports", "nodes", "clusters", "connections")
 
 class DiagramAgent:
-    INSTRUCTIONS = """You are an expert in creating serverless architecture diagrams using the Python 'diagrams' library.
+    INSTRUCTIONS_HEADER = """You are an expert in creating serverless architecture diagrams using the Python 'diagrams' library.
     You MUST respond with ONLY valid JSON in the exact format shown below, with no additional text or formatting:
 
-    For GCP services, use these correct import paths:
+    """
+
+    # Only the selected platform's catalog is sent to the model
+    PLATFORM_IMPORTS = {
+        "gcp": """For GCP services, use these correct import paths:
     - from diagrams.gcp.compute import Functions, Run
     - from diagrams.gcp.api import APIGateway
     - from diagrams.gcp.database import Firestore
     - from diagrams.gcp.storage import Storage
     - from diagrams.gcp.analytics import Pubsub
     - from diagrams.gcp.security import Iam, KMS
-    - from diagrams.gcp.operations import Monitoring
-
-    For AWS services, use these correct import paths:
+    - from diagrams.gcp.operations import Monitoring""",
+        "aws": """For AWS services, use these correct import paths:
     - from diagrams.aws.compute import Lambda
     - from diagrams.aws.mobile import APIGateway
     - from diagrams.aws.database import DynamodbTable
     - from diagrams.aws.storage import SimpleStorageServiceS3
     - from diagrams.aws.integration import SimpleQueueServiceSqs
     - from diagrams.aws.security import Cognito, SecretsManager
-    - from diagrams.aws.management import Cloudwatch
-
-    For Azure services, use these correct import paths:
+    - from diagrams.aws.management import Cloudwatch""",
+        "azure": """For Azure services, use these correct import paths:
     - from diagrams.azure.compute import FunctionApps
     - from diagrams.azure.web import AppServices
     - from diagrams.azure.database import CosmosDb
     - from diagrams.azure.storage import StorageAccounts
     - from diagrams.azure.integration import ServiceBus
     - from diagrams.azure.security import KeyVaults
-    - from diagrams.azure.monitor import Monitor
+    - from diagrams.azure.monitor import Monitor"""
+    }
+
+    INSTRUCTIONS = """
 
     {
         "imports": [
@@ -77,11 +95,36 @@ class DiagramAgent:
     7. Keep the diagram clean and readable"""
 
     def __init__(self, client: Swarm):
-        self.agent = Agent(
-            name="Diagram Generator",
-            instructions=self.INSTRUCTIONS
-        )
+        self.agents = {
+            platform: Agent(
+                name="Diagram Generator",
+                instructions=self.INSTRUCTIONS_HEADER + imports + self.INSTRUCTIONS
+            )
+            for platform, imports in self.PLATFORM_IMPORTS.items()
+        }
+        self.agent = self.agents["gcp"]
         self.client = client
+        # Generated code per (architecture type, platform, normalized requirement)
+        # The agent is shared by every session, so guard the cache with a lock
+        self._diagram_cache: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._diagram_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _is_from_import(statement: str) -> bool:
+        """Check that a statement has the form "from package.module import Name, Other"."""
+        parts = statement.split(None, 3)
+        return (
+            len(parts) == 4
+            and parts[0] == "from"
+            and parts[2] == "import"
+            and all(p.isidentifier() for p in parts[1].split("."))
+            and all(n.isidentifier() for n in parts[3].replace(",", " ").split())
+        )
+
+    @staticmethod
+    def _normalize_requirement(requirement: str) -> str:
+        """Ignore case and whitespace differences so trivial edits reuse a diagram."""
+        return " ".join(requirement.lower().split())
 
     def generate_diagram(
         self,
@@ -91,37 +134,42 @@ class DiagramAgent:
         style: Optional[dict] = None
     ) -> str:
         """Generate diagram code based on requirements."""
-        diagram_prompt = f"""Analyze the following requirement and create a {platform.upper()} serverless architecture diagram:
-
-        Requirement: {requirement}
-        Architecture Type: {architecture_type}
-        Platform: {platform}
+        cache_key = (architecture_type, platform, self._normalize_requirement(requirement))
+        with self._diagram_cache_lock:
+            if cache_key in self._diagram_cache:
+                self._diagram_cache.move_to_end(cache_key)
+                return self._diagram_cache[cache_key]
 
-        Create a serverless architecture using {platform.upper()} native services.
-        Include API Gateway, Functions/Lambda, Database, Storage, Security, and Monitoring components.
+        # Static guidance first so the prompt prefix is identical across runs
+        diagram_prompt = f"""Include API Gateway, Functions/Lambda, Database, Storage, Security, and Monitoring components.
         Show the data flow between services with proper edge colors and labels.
         Group related services in logical clusters.
 
         RESPOND ONLY WITH VALID JSON that defines the architecture diagram.
         DO NOT include any explanatory text or descriptions - only the JSON structure.
+
+        Create a serverless architecture using {platform.upper()} native services for the following requirement:
+
+        Architecture Type: {architecture_type}
+        Platform: {platform}
+        Requirement: {requirement}
         """
 
         # Collect the complete response using streaming
         full_response = []
-        stream = self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": diagram_prompt}],
-            stream=True
-        )
+        agent = self.agents.get(platform, self.agent)
+        messages = [{"role": "user", "content": diagram_prompt}]
+        # Only cache the reply once it has produced usable code, so a bad one isn't replayed
+        stream = cached_run(self.client, agent, messages, store=False)
         
         for chunk in stream:
-            if isinstance(chunk, dict) and "content" in chunk:
-                full_response.append(chunk["content"])
-            elif isinstance(chunk, str):
+            if isinstance(chunk, dict):
+                chunk = chunk.get("content")
+            if chunk:
                 full_response.append(chunk)
 
         # Join all chunks into a single string
-        content = ''.join(filter(None, full_response))
+        content = ''.join(full_response)
 
         try:
             # Try to find JSON in the response
@@ -137,64 +185,96 @@ class DiagramAgent:
             json_content = json.loads(content)
             
             # Validate required keys
-            required_keys = ["imports", "nodes", "clusters", "connections"]
-            missing_keys = [key for key in required_keys if key not in json_content]
+            missing_keys = [key for key in _REQUIRED_KEYS if key not in json_content]
             if missing_keys:
                 raise ValueError(f"Missing required keys in JSON: {missing_keys}")
 
             # Generate Python code from JSON with proper indentation
             code = []
             
-            # Add imports on separate lines
+            # Add imports on separate lines; anything that isn't a "from X import Y"
+            # statement is reported rather than dropped, since the classes it was
+            # meant to provide would otherwise fail later with a NameError
+            has_diagram_import = False
+            rejected_imports = []
             for import_stmt in json_content["imports"]:
-                code.append(import_stmt)
+                quoted = _QUOTE_RE.match(import_stmt)
+                cleaned = quoted.group(1).strip() if quoted else import_stmt.strip()
+                if not cleaned:
+                    continue
+                if not self._is_from_import(cleaned):
+                    rejected_imports.append(cleaned)
+                    continue
+                if cleaned.startswith("from diagrams import"):
+                    has_diagram_import = True
+                code.append(cleaned)
+            if rejected_imports:
+                raise ValueError(f"Invalid import statements (expected 'from X import Y'): {rejected_imports}")
+            if not has_diagram_import:
+                code.insert(0, _DIAGRAM_IMPORT)
             code.append("")
             
             # Create diagram
-            code.append(f'with Diagram("{architecture_type}", show=False):')
+            code.append(f'with Diagram("{architecture_type}", filename="{DIAGRAM_FILENAME}", show=False):')
             
-            # Create cluster definitions with proper indentation
             current_indent = "    "
+            cluster_indent = current_indent + "    "
+            
+            # Group nodes under their cluster (referenced by label or name); nodes
+            # without a known cluster sit directly in the diagram
+            cluster_nodes: Dict[str, list] = {}
+            cluster_aliases: Dict[str, str] = {}
             for cluster in json_content["clusters"]:
-                cluster_def = f'{current_indent}with Cluster("{cluster["label"]}"):'
-                code.append(cluster_def)
-                code.append(f'{current_indent}    pass  # {cluster["label"]} services')
+                cluster_nodes.setdefault(cluster["label"], [])
+                cluster_aliases[cluster["label"]] = cluster["label"]
+                if cluster.get("name"):
+                    cluster_aliases.setdefault(cluster["name"], cluster["label"])
+            top_level_nodes = []
+            for node in json_content["nodes"]:
+                label = cluster_aliases.get(node.get("cluster") or "")
+                (cluster_nodes[label] if label else top_level_nodes).append(node)
             
-            # Add a blank line before nodes
-            code.append("")
+            for node in top_level_nodes:
+                code.append(f'{current_indent}{node["name"]} = {node["type"]}("{node["label"]}")')
             
-            # Create nodes at the correct indentation level
-            for node in json_content["nodes"]:
-                cluster = node.get("cluster")
-                indent = current_indent
-                if cluster:
-                    # Find the cluster this node belongs to and adjust indentation
-                    for c in json_content["clusters"]:
-                        if c["label"] == cluster:
-                            indent += "    "
-                            break
-                node_def = f'{indent}{node["name"]} = {node["type"]}("{node["label"]}")'
-                code.append(node_def)
+            # Each cluster is its own block with its nodes inside it
+            for label, nodes in cluster_nodes.items():
+                code.append(f'{current_indent}with Cluster("{label}"):')
+                for node in nodes:
+                    code.append(f'{cluster_indent}{node["name"]} = {node["type"]}("{node["label"]}")')
+                if not nodes:
+                    code.append(f'{cluster_indent}pass  # {label} services')
             
             # Add a blank line before connections
             code.append("")
             
-            # Create connections
+            # Create connections, formatting each distinct set of edge attributes once
+            edge_cache: Dict[tuple, str] = {}
             for conn in json_content["connections"]:
-                edge_attrs = conn.get("edge_attrs", {})
-                attrs = ", ".join(f'{k}="{v}"' for k, v in edge_attrs.items())
-                edge = f'Edge({attrs})' if attrs else ''
-                code.append(f'{current_indent}{conn["from"]} >> {edge} >> {conn["to"]}')
+                edge_attrs = conn.get("edge_attrs") or {}
+                key = tuple((k, str(v)) for k, v in edge_attrs.items())
+                edge = edge_cache.get(key)
+                if edge is None:
+                    attrs = ", ".join(f'{k}="{v}"' for k, v in key)
+                    edge = edge_cache[key] = f'Edge({attrs}) >> ' if attrs else ''
+                code.append(f'{current_indent}{conn["from"]} >> {edge}{conn["to"]}')
             
             # Join the code lines
             final_code = '\n'.join(code)
             
-            # Validate the generated code
+            # Validate the generated code before it is cached or rendered
             try:
-                compile(final_code, '<string>', 'exec')
-            except IndentationError as e:
-                raise ValueError(f"Generated code has invalid indentation: {str(e)}")
+                compile(final_code, '<diagram>', 'exec')
+            except SyntaxError as e:
+                raise ValueError(f"Generated code is not valid Python: {str(e)}")
             
+            # Only code that compiled above is cached
+            store_response(agent, messages, content)
+            with self._diagram_cache_lock:
+                self._diagram_cache[cache_key] = final_code
+                self._diagram_cache.move_to_end(cache_key)
+                if len(self._diagram_cache) > _DIAGRAM_CACHE_SIZE:
+                    self._diagram_cache.popitem(last=False)
             return final_code
             
         except json.JSONDecodeError as e:
@@ -1,5 +1,7 @@
 """Requirement Elaborator Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run
+from agent_instructions import NFR_ANALYSIS_PROMPT_TEMPLATE
 from typing import Dict, List, Tuple, Generator
 
 class ElaboratorAgent:
@@ -27,10 +29,10 @@ class ElaboratorAgent:
         """
         initial_prompt = f"Requirement: {requirement}\nApplication Type: {app_type}"
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": initial_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": initial_prompt}]
         )
 
     def analyze_nfr(self, nfr_content: str, app_type: str) -> Generator:
@@ -40,42 +42,13 @@ class ElaboratorAgent:
         """
         nfr_prompt = self.get_nfr_analysis_prompt(nfr_content, app_type)
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": nfr_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": nfr_prompt}]
         )
 
     @staticmethod
     def get_nfr_analysis_prompt(nfr_content: str, app_type: str) -> str:
-        """Returns the NFR analysis prompt template."""
-        return f"""Original NFR Document Content:
-        {nfr_content}
-
-        Analyze these Non-Functional Requirements for a {app_type}. 
-        Structure your analysis as follows:
-
-        1. NFR CATEGORIES IDENTIFICATION
-        First, clearly identify and list all NFR categories present in the document (e.g., Performance, Security, Scalability, etc.)
-
-        2. DETAILED CATEGORY ANALYSIS
-        For each identified category, provide:
-           a) Category Name
-           b) Description
-           c) Specific Requirements List
-           d) Quantifiable Metrics
-           e) Implementation Guidelines
-           f) Validation Criteria
-           g) Dependencies with other NFRs
-
-        3. CROSS-CUTTING CONCERNS
-           - How different NFR categories interact
-           - Potential conflicts between categories
-           - Priority order of NFR categories
-
-        4. IMPLEMENTATION IMPACT
-           - Impact on system architecture
-           - Impact on development process
-           - Resource requirements per category
-
-        Format the response in a clear, categorical structure that can be easily referenced in subsequent analyses.""" 
\ No newline at end of file
+        """Returns the NFR analysis prompt, with the document last so the prefix stays static."""
+        return NFR_ANALYSIS_PROMPT_TEMPLATE.format(nfr_content=nfr_content, app_type=app_type) 
\ No newline at end of file
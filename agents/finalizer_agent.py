@@ -1,5 +1,6 @@
 """Requirement Finalizer Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run
 from typing import Generator, Dict, Optional
 
 class FinalizerAgent:
@@ -51,10 +52,10 @@ class FinalizerAgent:
             nfr_section=nfr_section
         )
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": final_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": final_prompt}]
         )
 
     def _construct_final_prompt(
@@ -76,21 +77,11 @@ class FinalizerAgent:
         Returns:
             Formatted prompt for final requirements
         """
+        # Static structure first and the (large, per-run) inputs last, so the prompt prefix is cacheable
         return f"""
-        Review and incorporate ALL of the following inputs to create the final requirements specification:
+        Review and incorporate ALL of the inputs at the end of this message to create the final requirements specification.
 
-        ORIGINAL REQUIREMENT:
-        {original_requirement}
-
-        ELABORATED REQUIREMENTS:
-        {elaboration}
-
-        VALIDATION FEEDBACK:
-        {validation}
-
-        {nfr_section}
-
-        Based on ALL the above analyses, create a comprehensive final requirements document that incorporates 
+        Based on ALL of these analyses, create a comprehensive final requirements document that incorporates 
         and refines these insights. Follow this exact structure:
 
         A. EXECUTIVE SUMMARY
@@ -124,6 +115,17 @@ class FinalizerAgent:
         3. NFR requirements must be integrated throughout all sections
         4. Clear traceability must exist between requirements, NFRs, and use cases
         5. No content from the NFR analysis should be lost or summarized
+
+        ORIGINAL REQUIREMENT:
+        {original_requirement}
+
+        ELABORATED REQUIREMENTS:
+        {elaboration}
+
+        VALIDATION FEEDBACK:
+        {validation}
+
+        {nfr_section}
         """
 
     def get_agent(self):
@@ -1,5 +1,6 @@
 """Jira Ticket Creator Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run, store_response
 from typing import Generator, Optional, Dict
 import json
 
@@ -58,36 +59,17 @@ class JiraAgent:
         Create Jira tickets based on requirements analysis.
         Returns the complete JSON response instead of a stream.
         """
-        jira_prompt = f"""RESPOND ONLY WITH VALID JSON IN THIS EXACT FORMAT:
-        {{
-            "epic": {{
-                "type": "epic",
-                "summary": "Main epic title",
-                "description": "Detailed epic description"
-            }},
-            "stories": [
-                {{
-                    "type": "story",
-                    "summary": "Story title",
-                    "description": "As a [user], I want [feature] so that [benefit]",
-                    "story_points": 5
-                }}
-            ],
-            "tasks": [
-                {{
-                    "type": "task",
-                    "summary": "Task title",
-                    "description": "Technical implementation details"
-                }}
-            ],
-            "tests": [
-                {{
-                    "type": "test",
-                    "summary": "Test case title",
-                    "description": "Test case details"
-                }}
-            ]
-        }}
+        # The JSON format is already in the agent instructions, so it isn't repeated here
+        jira_prompt = f"""RESPOND ONLY WITH VALID JSON IN THE EXACT FORMAT GIVEN IN YOUR INSTRUCTIONS.
+
+        IMPORTANT:
+        1. Respond ONLY with the JSON structure from your instructions
+        2. Do not include any text before or after the JSON
+        3. Ensure all JSON strings are properly escaped
+        4. Include at least one story, task, and test case
+        5. Make sure the epic summary matches the main requirement
+        6. Story descriptions must follow "As a [user]..." format
+        7. All descriptions must be clear and detailed
 
         Create Jira tickets for:
         
@@ -103,33 +85,22 @@ class JiraAgent:
         
         Project Key: {project_key}
         Component: {component}
-
-        IMPORTANT:
-        1. Respond ONLY with the JSON structure shown above
-        2. Do not include any text before or after the JSON
-        3. Ensure all JSON strings are properly escaped
-        4. Include at least one story, task, and test case
-        5. Make sure the epic summary matches the main requirement
-        6. Story descriptions must follow "As a [user]..." format
-        7. All descriptions must be clear and detailed
         """
         
         # Collect the complete response using streaming
         full_response = []
-        stream = self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": jira_prompt}],
-            stream=True
-        )
+        messages = [{"role": "user", "content": jira_prompt}]
+        # Only cache the reply once it has parsed, so a malformed one isn't replayed
+        stream = cached_run(self.client, self.agent, messages, store=False)
         
         for chunk in stream:
-            if isinstance(chunk, dict) and "content" in chunk:
-                full_response.append(chunk["content"])
-            elif isinstance(chunk, str):
+            if isinstance(chunk, dict):
+                chunk = chunk.get("content")
+            if chunk:
                 full_response.append(chunk)
 
         # Join all chunks into a single string
-        content = ''.join(filter(None, full_response))
+        content = ''.join(full_response)
 
         # Parse and validate JSON
         try:
@@ -147,6 +118,7 @@ class JiraAgent:
             missing_keys = [key for key in required_keys if key not in tickets]
             if missing_keys:
                 raise ValueError(f"Missing required keys in JSON: {missing_keys}")
+            store_response(self.agent, messages, content)
             return tickets
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON response: {str(e)}\nResponse: {content}")
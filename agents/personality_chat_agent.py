@@ -37,22 +37,8 @@ class PersonalityChatAgent:
         # Extract key personality aspects
         personality_context = self._build_personality_context(profile_data)
         
+        # Static question catalog first; profile, history and the new message last
         chat_prompt = f"""
-        PERSONALITY PROFILE:
-        {personality_context}
-
-        USER MESSAGE: {user_message}
-
-        PREVIOUS CONVERSATION:
-        {self._format_chat_history(chat_history) if chat_history else 'No previous messages'}
-
-        Provide strategic advice that:
-        1. Aligns with their {personalities.get('disc_type', 'unknown')} communication preferences
-        2. Considers their {personalities.get('archetype', 'unknown')} archetype tendencies
-        3. Leverages their behavioral traits and motivations
-        4. Matches their business and negotiation style
-        5. Addresses potential objections or concerns
-
         Here are some strategic questions you can ask to improve your sales approach:
 
         Negotiation Strategy:
@@ -85,7 +71,22 @@ class PersonalityChatAgent:
         • "How do I know when they're ready to move forward?"
         • "What signs indicate they're not fully convinced?"
 
+        PERSONALITY PROFILE:
+        {personality_context}
+
+        Provide strategic advice that:
+        1. Aligns with their {personalities.get('disc_type', 'unknown')} communication preferences
+        2. Considers their {personalities.get('archetype', 'unknown')} archetype tendencies
+        3. Leverages their behavioral traits and motivations
+        4. Matches their business and negotiation style
+        5. Addresses potential objections or concerns
+
         Provide specific, actionable advice that helps the user communicate more effectively with {data.get('first_name', 'unknown')}.
+
+        PREVIOUS CONVERSATION:
+        {self._format_chat_history(chat_history) if chat_history else 'No previous messages'}
+
+        USER MESSAGE: {user_message}
         """
 
         return self.client.run(
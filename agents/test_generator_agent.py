@@ -1,5 +1,6 @@
 """Test Case Generator Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run
 from typing import Generator
 
 class TestGeneratorAgent:
@@ -87,16 +88,16 @@ class TestGeneratorAgent:
         """
         nfr_section = f"\nNon-Functional Requirements:\n{nfr_analysis}" if nfr_analysis else ""
         test_prompt = f"""
+        Programming Language: {programming_language}
         Original Requirement: {requirement}
         Final Requirements: {final_requirements}
         {nfr_section}
-        Programming Language: {programming_language}
         """
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": test_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": test_prompt}]
         )
 
     def get_agent(self):
@@ -1,5 +1,6 @@
 """Requirement Validator Agent"""
 from swarm import Agent, Swarm
+from response_cache import cached_run
 from typing import Generator
 
 class ValidatorAgent:
@@ -68,22 +69,23 @@ class ValidatorAgent:
             Generator for the validation stream
         """
         nfr_section = f"\nNon-Functional Requirements Analysis:\n{nfr_analysis}" if nfr_analysis else ""
+        # Static guidance first so the prompt prefix is identical across runs
         validation_prompt = f"""
-        Functional Requirements:
-        {elaboration}
-        {nfr_section}
-        
-        Validate both functional and non-functional requirements, considering:
+        Validate both functional and non-functional requirements below, considering:
         1. Completeness and clarity
         2. Consistency between functional and non-functional requirements
         3. Feasibility of implementation
         4. Testability of all requirements
+        
+        Functional Requirements:
+        {elaboration}
+        {nfr_section}
         """
         
-        return self.client.run(
-            agent=self.agent,
-            messages=[{"role": "user", "content": validation_prompt}],
-            stream=True
+        return cached_run(
+            self.client,
+            self.agent,
+            messages=[{"role": "user", "content": validation_prompt}]
         )
 
     def get_agent(self):
@@ -0,0 +1,93 @@
+"""Render generated architecture diagram code in a persistent worker process.
+
+Executing the code in a long-lived worker keeps the working directory change
+out of the Streamlit server and pays for importing the diagrams package once
+per worker rather than once per render.
+"""
+import contextlib
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Recycle the worker periodically so state left behind by generated code doesn't accumulate
+MAX_RENDERS_PER_WORKER = 50
+RENDER_TIMEOUT = 60
+# Generated diagram code names its output DIAGRAM_FILENAME, so the PNG lands at a known path
+DIAGRAM_FILENAME = "diagram"
+
+def _render_in_worker(diagram_code: str) -> bytes:
+    """Execute diagram code in a temporary directory and return the generated PNG"""
+    compiled = compile(diagram_code, "<diagram>", "exec")
+    output = io.StringIO()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cwd = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            with contextlib.redirect_stdout(output):
+                exec(compiled, {"__name__": "__main__"})
+        except Exception as e:
+            raise RuntimeError(f"Error executing diagram code: {e}") from None
+        finally:
+            os.chdir(cwd)
+
+        diagram_path = os.path.join(temp_dir, f"{DIAGRAM_FILENAME}.png")
+        if not os.path.isfile(diagram_path):
+            raise RuntimeError(
+                "No diagram file generated\n"
+                f"Directory contents: {', '.join(os.listdir(temp_dir))}\n"
+                f"Process output: {output.getvalue()}"
+            )
+        with open(diagram_path, "rb") as f:
+            return f.read()
+
+class DiagramRenderer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    @staticmethod
+    def _create_executor() -> ProcessPoolExecutor:
+        # Spawn rather than fork: the Streamlit server is multi-threaded
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=MAX_RENDERS_PER_WORKER
+        )
+
+    def render(self, diagram_code: str, timeout: float = RENDER_TIMEOUT) -> bytes:
+        """Render diagram code in the worker process and return the PNG bytes"""
+        with self._lock:
+            executor = self._executor
+        try:
+            return executor.submit(_render_in_worker, diagram_code).result(timeout=timeout)
+        except BrokenProcessPool:
+            # The worker died (e.g. a crash in generated code); start a fresh one for the next render
+            self._replace_executor(executor)
+            raise RuntimeError("Diagram worker process exited unexpectedly")
+        except TimeoutError:
+            # The single worker is stuck, so every later render would queue behind it
+            self._replace_executor(executor)
+            raise RuntimeError(f"Diagram rendering timed out after {timeout:g} seconds")
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Swap in a fresh executor (once per failure) and kill the old worker."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = self._create_executor()
+        self._discard_executor(executor)
+
+    @staticmethod
+    def _discard_executor(executor: ProcessPoolExecutor) -> None:
+        # ProcessPoolExecutor only gained a public way to stop a busy worker in Python 3.14
+        terminate_workers = getattr(executor, "terminate_workers", None)
+        if terminate_workers is not None:
+            terminate_workers()
+            return
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
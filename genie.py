@@ -1,10 +1,8 @@
 from dotenv import load_dotenv
-import os
-import json
-import tempfile
-import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from jira_service import JiraService
+from diagram_renderer import DiagramRenderer
+from stream_helpers import stream_to_placeholder
 from agents.elaborator_agent import ElaboratorAgent
 from agents.validator_agent import ValidatorAgent
 from agents.finalizer_agent import FinalizerAgent
@@ -18,24 +16,28 @@ from agents.diagram_agent import DiagramAgent
 load_dotenv()
 
 import streamlit as st
-from swarm import Swarm, Agent
-from streamlit_extras.stateful_button import button
-import time
+from swarm import Swarm
 from PyPDF2 import PdfReader
 
-# Initialize Swarm client
-client = Swarm()
+# Initialize Swarm client once per process so its HTTP connections survive reruns.
+# No spinner: this runs before st.set_page_config, which must be the first element
+@st.cache_resource(show_spinner=False)
+def get_client() -> Swarm:
+    return Swarm()
 
-# Initialize agents
-def create_agents(client: Swarm):
-    elaborator = ElaboratorAgent(client)
-    validator = ValidatorAgent(client)
-    finalizer = FinalizerAgent(client)
-    test_generator = TestGeneratorAgent(client)
-    code_generator = CodeGeneratorAgent(client)
-    code_reviewer = CodeReviewerAgent(client)
-    jira_creator = JiraAgent(client)
-    diagram_generator = DiagramAgent(client)
+client = get_client()
+
+# Initialize agents once per process; Streamlit reruns this script on every interaction
+@st.cache_resource
+def create_agents(_client: Swarm):
+    elaborator = ElaboratorAgent(_client)
+    validator = ValidatorAgent(_client)
+    finalizer = FinalizerAgent(_client)
+    test_generator = TestGeneratorAgent(_client)
+    code_generator = CodeGeneratorAgent(_client)
+    code_reviewer = CodeReviewerAgent(_client)
+    jira_creator = JiraAgent(_client)
+    diagram_generator = DiagramAgent(_client)
     
     return elaborator, validator, finalizer, test_generator, code_generator, code_reviewer, jira_creator, diagram_generator
 
@@ -135,26 +137,21 @@ requirement = st.text_input(
     key="requirement_input"
 )
 
-def stream_content(tab_placeholder):
-    """Improved streaming function with better UI"""
-    message_placeholder = tab_placeholder.empty()
-    full_response = []
+def stream_content(tab_placeholder, stream) -> str:
+    """Render an agent stream into the tab and return the complete response"""
+    return stream_to_placeholder(stream, tab_placeholder.empty())
 
-    def handle_chunk(chunk):
-        try:
-            content = None
-            if isinstance(chunk, dict) and "content" in chunk:
-                content = chunk["content"]
-            elif isinstance(chunk, str):
-                content = chunk
-                
-            if content is not None:  # Only append and update if content exists
-                full_response.append(content)
-                message_placeholder.markdown(''.join(full_response))
-        except Exception as e:
-            st.error(f"Streaming error: {str(e)}")
-    
-    return handle_chunk, full_response
+# Diagram code runs in a worker process that is started once per server process
+@st.cache_resource
+def get_diagram_renderer() -> DiagramRenderer:
+    return DiagramRenderer()
+
+# Rendered diagrams are cached per code string, so reruns and repeated requirements
+# skip executing the diagram code again
+@st.cache_data(show_spinner=False, max_entries=32)
+def render_diagram(diagram_code: str) -> bytes:
+    """Execute generated diagram code and return the resulting PNG"""
+    return get_diagram_renderer().render(diagram_code)
 
 # Define dynamic tab names based on NFR presence
 def get_tab_names(has_nfrs):
@@ -169,6 +166,18 @@ if st.button("Analyze"):
             # Create agents with client
             elaborator, validator, finalizer, test_generator, code_generator, code_reviewer, jira_creator, diagram_generator = create_agents(client)
             
+            # The diagram only depends on the original requirement, so generate it in the
+            # background while the sequential analysis stages stream into their tabs
+            diagram_executor = ThreadPoolExecutor(max_workers=1)
+            diagram_future = diagram_executor.submit(
+                diagram_generator.generate_diagram,
+                requirement=requirement,
+                architecture_type=app_type,
+                platform=cloud_environment.lower(),
+                style={"direction": "TB", "show_labels": True}
+            )
+            diagram_executor.shutdown(wait=False)
+            
             # Determine if we have NFRs and create tabs accordingly
             has_nfrs = bool(nfr_content.strip())
             TAB_NAMES = get_tab_names(has_nfrs)
@@ -180,17 +189,10 @@ if st.button("Analyze"):
             # Elaboration of functional requirements
             with tabs[current_tab]:
                 st.subheader("Elaborated Functional Requirements")
-                handle_chunk, elaboration_content = stream_content(tabs[current_tab])
-                
                 # Get the stream directly from the agent
                 elaboration_stream = elaborator.elaborate_requirements(requirement, app_type)
                 
-                # Stream the chunks for UI updates
-                for chunk in elaboration_stream:
-                    handle_chunk(chunk)
-                
-                # Store the elaboration for later use
-                elaboration = ''.join(filter(None, elaboration_content))
+                elaboration = stream_content(tabs[current_tab], elaboration_stream)
                 st.sidebar.success("✅ Functional Requirements Analysis Complete")
             current_tab += 1
 
@@ -199,39 +201,28 @@ if st.button("Analyze"):
             if has_nfrs:
                 with tabs[current_tab]:
                     st.subheader("Non-Functional Requirements Analysis")
-                    handle_chunk, nfr_analysis_content = stream_content(tabs[current_tab])
-                    
                     # Get the stream directly from the agent
                     nfr_stream = elaborator.analyze_nfr(nfr_content, app_type)
-                    for chunk in nfr_stream:
-                        handle_chunk(chunk)
-                    
-                    nfr_analysis = ''.join(filter(None, nfr_analysis_content))
+                    nfr_analysis = stream_content(tabs[current_tab], nfr_stream)
                     st.sidebar.success("✅ NFR Analysis Complete")
                 current_tab += 1
 
             # Validation
             with tabs[current_tab]:
                 st.subheader("Validation Review")
-                handle_chunk, validation_content = stream_content(tabs[current_tab])
-                
                 # Get validation stream from the agent
                 validation_stream = validator.validate_requirements(
                     elaboration=elaboration,
                     nfr_analysis=nfr_analysis if has_nfrs else ""
                 )
                 
-                for chunk in validation_stream:
-                    handle_chunk(chunk)
-                validation = ''.join(filter(None, validation_content))
+                validation = stream_content(tabs[current_tab], validation_stream)
                 st.sidebar.success("✅ Validation Complete")
             current_tab += 1
 
             # Final requirements
             with tabs[current_tab]:
                 st.subheader("Final Requirements")
-                handle_chunk, final_content = stream_content(tabs[current_tab])
-                
                 # Prepare NFR data if available
                 nfr_data = None
                 if has_nfrs:
@@ -248,17 +239,18 @@ if st.button("Analyze"):
                     nfr_data=nfr_data
                 )
                 
-                for chunk in final_stream:
-                    handle_chunk(chunk)
-                final_requirements = ''.join(filter(None, final_content))
+                final_requirements = stream_content(tabs[current_tab], final_stream)
+                # Every later stage is built on the final requirements, so don't spend
+                # model calls on empty prompts if finalization produced nothing
+                if not final_requirements.strip():
+                    st.error("Finalization returned no requirements. Please try again.")
+                    st.stop()
                 st.sidebar.success("✅ Final Requirements Complete")
             current_tab += 1
 
             # Test Cases
             with tabs[current_tab]:
                 st.subheader("Test Cases")
-                handle_chunk, test_content = stream_content(tabs[current_tab])
-                
                 # Get test cases stream from the agent
                 test_stream = test_generator.generate_test_cases(
                     requirement=requirement,
@@ -267,17 +259,13 @@ if st.button("Analyze"):
                     nfr_analysis=nfr_analysis if has_nfrs else ""
                 )
                 
-                for chunk in test_stream:
-                    handle_chunk(chunk)
-                test_cases = ''.join(filter(None, test_content))
+                test_cases = stream_content(tabs[current_tab], test_stream)
                 st.sidebar.success("✅ Test Cases Generated")
             current_tab += 1
 
             # Code Generation
             with tabs[current_tab]:
                 st.subheader("Generated Code")
-                handle_chunk, code_content = stream_content(tabs[current_tab])
-                
                 # Get code generation stream from the agent
                 code_stream = code_generator.generate_code(
                     final_requirements=final_requirements,
@@ -286,17 +274,13 @@ if st.button("Analyze"):
                     nfr_analysis=nfr_analysis if has_nfrs else None
                 )
                 
-                for chunk in code_stream:
-                    handle_chunk(chunk)
-                generated_code = ''.join(filter(None, code_content))
+                generated_code = stream_content(tabs[current_tab], code_stream)
                 st.sidebar.success("✅ Code Generated")
             current_tab += 1
 
             # Code Review
             with tabs[current_tab]:
                 st.subheader("Code Review Analysis")
-                handle_chunk, review_content = stream_content(tabs[current_tab])
-                
                 review_stream = code_reviewer.review_code(
                     final_requirements=final_requirements,
                     generated_code=generated_code,
@@ -304,8 +288,7 @@ if st.button("Analyze"):
                     nfr_analysis=nfr_analysis if has_nfrs else ""
                 )
                 
-                for chunk in review_stream:
-                    handle_chunk(chunk)
+                stream_content(tabs[current_tab], review_stream)
                 st.sidebar.success("✅ Code Review Complete")
             current_tab += 1
 
@@ -313,9 +296,6 @@ if st.button("Analyze"):
             if update_jira:
                 with st.spinner("Creating Jira tickets..."):
                     try:
-                        # Get the complete review content
-                        review_text = ''.join(filter(None, review_content))
-                        
                         # Create Jira tickets
                         jira_stream = jira_creator.create_tickets(
                             project_key=jira_project,
@@ -341,66 +321,23 @@ if st.button("Analyze"):
             # Generate Architecture Diagram
             with tabs[current_tab]:
                 st.subheader("Architecture Diagram")
-                handle_chunk, diagram_content = stream_content(tabs[current_tab])
-                
-                # Get diagram code stream from the agent
-                diagram_stream = diagram_generator.generate_diagram(
-                    requirement=requirement,
-                    architecture_type=app_type,
-                    platform=cloud_environment.lower(),
-                    style={"direction": "TB", "show_labels": True}
-                )
-                
-                for chunk in diagram_stream:
-                    handle_chunk(chunk)
-                
-                # Get the complete diagram code
-                diagram_code = ''.join(filter(None, diagram_content))
-                
-                # Show the diagram code in an expandable section
-                with st.expander("View Diagram Code"):
-                    st.code(diagram_code, language="python")
-                
                 try:
+                    # Wait for the diagram code generated in the background
+                    diagram_code = diagram_future.result()
+                    stream_content(tabs[current_tab], [diagram_code])
+
+                    # Show the diagram code in an expandable section
+                    with st.expander("View Diagram Code"):
+                        st.code(diagram_code, language="python")
+
                     with st.spinner("Generating diagram..."):
-                        # Create a temporary directory for diagram generation
-                        with tempfile.TemporaryDirectory() as temp_dir:
-                            # Create paths
-                            temp_py_path = os.path.join(temp_dir, "diagram.py")
-                            
-                            # Save the code
-                            with open(temp_py_path, "w") as f:
-                                f.write(diagram_code)
-                            
-                            # Execute the diagram code using subprocess
-                            process = subprocess.run(
-                                [sys.executable, temp_py_path],
-                                cwd=temp_dir,
-                                capture_output=True,
-                                text=True
-                            )
-                            
-                            if process.returncode != 0:
-                                st.error("Error executing diagram code:")
-                                st.error(process.stderr)
-                            else:
-                                # Look for the generated diagram
-                                diagram_files = [f for f in os.listdir(temp_dir) if f.endswith('.png')]
-                                if diagram_files:
-                                    diagram_path = os.path.join(temp_dir, diagram_files[0])
-                                    with open(diagram_path, "rb") as f:
-                                        st.image(f.read())
-                                else:
-                                    st.error("No diagram file generated")
-                                    st.error("Directory contents:")
-                                    st.code('\n'.join(os.listdir(temp_dir)))
-                                    st.error("Process output:")
-                                    st.code(process.stdout)
-                                
+                        st.image(render_diagram(diagram_code))
+
+                    st.sidebar.success("✅ Architecture Diagram Generated")
                 except Exception as e:
+                    # A diagram failure only affects this tab; the other stages have already finished
                     st.error(f"Error generating diagram: {str(e)}")
-                
-                st.sidebar.success("✅ Architecture Diagram Generated")
+                    st.info("Click Analyze again to retry the diagram.")
 
             # Show completion message
             st.sidebar.success("✨ Analysis Complete!")
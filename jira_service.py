@@ -1,16 +1,117 @@
 import requests
 from requests.auth import HTTPBasicAuth
-import json
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+# Project metadata is kept in memory for a few minutes so reruns skip the lookup.
+# Shared by every JiraService in the process, keyed by site, account and project.
+PROJECT_CACHE_TTL_SECONDS = 300
+_project_cache: Dict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]] = {}
+
+# Constant payload fragments shared by every issue of a given type
+_EPIC_ISSUETYPE = {"name": "Epic"}  # Use name instead of ID
+_STORY_ISSUETYPE = {"name": "Story"}
+_TASK_ISSUETYPE = {"name": "Task"}
+_REQGENIE_LABELS = ("ReqGenie",)
+
+# Friendly messages for the status codes Jira commonly returns on issue creation
+_ISSUE_ERROR_MESSAGES = {
+    401: "Authentication failed. Please check your Jira credentials.",
+    403: "Permission denied. Please check your Jira access rights.",
+    404: "Invalid Jira URL or endpoint not found.",
+}
+
+class JiraError(Exception):
+    """Raised when Jira rejects a request."""
+
+def _error_details(response) -> Any:
+    """Return Jira's structured error body when available, else the raw text."""
+    if response.headers.get("Content-Type", "").startswith("application/json"):
+        try:
+            return response.json()
+        except ValueError:
+            pass
+    return response.text
+
+def _issue_error(response) -> JiraError:
+    """Build the error for a failed issue-creation response."""
+    code = response.status_code
+    if code == 400:
+        error_msg = f"Invalid request: {_error_details(response)}"
+    else:
+        error_msg = _ISSUE_ERROR_MESSAGES.get(code, f"HTTP {code}: {response.text}")
+    return JiraError(f"Failed to create Jira issue: {error_msg}")
+
+@lru_cache(maxsize=512)
+def _create_description(text: str) -> Dict:
+    """Create a properly formatted description for Jira.
+
+    Results are cached by text and shared between payloads, so callers
+    must treat the returned document as read-only.
+    """
+    return {
+        "content": [
+            {
+                "content": [
+                    {
+                        "text": text,
+                        "type": "text"
+                    }
+                ],
+                "type": "paragraph"
+            }
+        ],
+        "type": "doc",
+        "version": 1
+    }
+
+def _issue_payload(project_key: str, summary: str, description: str,
+                   issuetype: Dict[str, str]) -> Dict[str, Any]:
+    """Build the create-issue payload shared by the epic, story and task helpers."""
+    return {
+        "fields": {
+            "project": {
+                "key": project_key
+            },
+            "summary": summary,
+            "description": _create_description(description),
+            "issuetype": issuetype,
+            "labels": list(_REQGENIE_LABELS)
+        }
+    }
+
+def _task_payload(project_key: str, summary: str, description: str, parent_key: str) -> Dict[str, Any]:
+    """Build a task payload that links to its parent story in the same request."""
+    payload = _issue_payload(project_key, summary, description, _TASK_ISSUETYPE)
+    payload["update"] = {
+        "issuelinks": [
+            {
+                "add": {
+                    "type": {"name": "Relates"},
+                    "inwardIssue": {"key": parent_key}
+                }
+            }
+        ]
+    }
+    return payload
+
+def _link_payload(outward_key: str, inward_key: str, link_type: str) -> Dict[str, Any]:
+    """Build the payload for linking two existing issues."""
+    return {
+        "outwardIssue": {"key": outward_key},
+        "inwardIssue": {"key": inward_key},
+        "type": {"name": link_type}
+    }
 
 class JiraService:
     def __init__(self):
         self.base_url = os.getenv('JIRA_BASE_URL')
         self.email = os.getenv('JIRA_EMAIL')
         self.api_token = os.getenv('JIRA_API_TOKEN')
-        self.issue_types = {}  # Initialize empty dict for issue types
+        self._issue_types_cache: Dict[str, Dict[str, str]] = {}  # Issue types per project key
         
         # Validate configuration
         if not all([self.base_url, self.email, self.api_token]):
@@ -21,16 +122,17 @@ class JiraService:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
+        
+        # Reuse one session so auth, headers and connections are shared across calls
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update(self.headers)
 
     def test_connection(self) -> bool:
-        """Test the Jira connection and credentials."""
+        """Test the Jira connection and credentials (never cached)."""
         try:
             url = f"{self.base_url}/rest/api/3/myself"
-            response = requests.get(
-                url,
-                headers=self.headers,
-                auth=self.auth
-            )
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             return True
         except requests.exceptions.RequestException as e:
@@ -39,171 +141,85 @@ class JiraService:
     def validate_project(self, project_key: str) -> bool:
         """Validate if the project exists and is accessible."""
         try:
-            url = f"{self.base_url}/rest/api/3/project/{project_key}"
-            response = requests.get(
-                url,
-                headers=self.headers,
-                auth=self.auth
-            )
-            response.raise_for_status()
+            project_data = self._get_project(project_key)
             
-            # Get available issue types for the project
-            self.issue_types = self._get_project_issue_types(project_key)
+            # Reuse the project response to populate the issue types cache
+            self._issue_types_cache[project_key] = self._parse_issue_types(project_data)
             return True
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Invalid or inaccessible project key '{project_key}': {str(e)}")
 
     def _get_project_issue_types(self, project_key: str) -> Dict[str, str]:
-        """Get available issue types for the project."""
+        """Get available issue types for the project, cached per project key."""
+        if project_key in self._issue_types_cache:
+            return self._issue_types_cache[project_key]
+
+        issue_types = self._parse_issue_types(self._get_project(project_key))
+        self._issue_types_cache[project_key] = issue_types
+        return issue_types
+
+    def _get_project(self, project_key: str) -> Dict[str, Any]:
+        """Fetch project metadata, served from the in-memory cache while fresh."""
+        cache_key = (self.base_url, self.email, project_key)
+        cached = _project_cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < PROJECT_CACHE_TTL_SECONDS:
+            return cached[1]
+
         url = f"{self.base_url}/rest/api/3/project/{project_key}"
-        response = requests.get(
-            url,
-            headers=self.headers,
-            auth=self.auth
-        )
+        response = self.session.get(url, timeout=30)
         response.raise_for_status()
-        project_data = response.json()
         
-        # Create a mapping of issue type names to IDs
+        project_data = response.json()
+        _project_cache[cache_key] = (time.monotonic(), project_data)
+        return project_data
+
+    @staticmethod
+    def _parse_issue_types(project_data: Dict[str, Any]) -> Dict[str, str]:
+        """Create a mapping of issue type names to IDs from project data."""
         return {
             issueType['name'].lower(): issueType['id']
             for issueType in project_data['issueTypes']
         } if 'issueTypes' in project_data else {}
 
-    def _create_description(self, text: str) -> Dict:
-        """Create a properly formatted description for Jira."""
-        return {
-            "content": [
-                {
-                    "content": [
-                        {
-                            "text": text,
-                            "type": "text"
-                        }
-                    ],
-                    "type": "paragraph"
-                }
-            ],
-            "type": "doc",
-            "version": 1
-        }
-
     def create_issue(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Create a Jira issue with the given payload."""
+        url = f"{self.base_url}/rest/api/3/issue"
         try:
-            url = f"{self.base_url}/rest/api/3/issue"
-            response = requests.post(
-                url,
-                data=json.dumps(payload),
-                headers=self.headers,
-                auth=self.auth
-            )
-            response.raise_for_status()
-            return response.json()
+            response = self.session.post(url, json=payload, timeout=30)
         except requests.exceptions.RequestException as e:
-            error_msg = str(e)
-            if hasattr(e, 'response'):
-                if e.response.status_code == 401:
-                    error_msg = "Authentication failed. Please check your Jira credentials."
-                elif e.response.status_code == 403:
-                    error_msg = "Permission denied. Please check your Jira access rights."
-                elif e.response.status_code == 404:
-                    error_msg = "Invalid Jira URL or endpoint not found."
-                elif e.response.status_code == 400:
-                    error_msg = f"Invalid request: {e.response.text}"
-            raise Exception(f"Failed to create Jira issue: {error_msg}")
+            raise JiraError(f"Failed to create Jira issue: {str(e)}")
+        if response.status_code in (200, 201):
+            return response.json()
+        raise _issue_error(response)
 
     def create_epic(self, project_key: str, summary: str, description: str) -> str:
         """Create an epic and return its key."""
-        # Get issue types if not already fetched
-        if not self.issue_types:
-            self.issue_types = self._get_project_issue_types(project_key)
-            
-        payload = {
-            "fields": {
-                "project": {
-                    "key": project_key
-                },
-                "summary": summary,
-                "description": self._create_description(description),
-                "issuetype": {
-                    "name": "Epic"  # Use name instead of ID
-                },
-                "labels": ["ReqGenie"]
-            }
-        }
+        # Get issue types (cached per project)
+        self._get_project_issue_types(project_key)
         
-        response = self.create_issue(payload)
+        response = self.create_issue(_issue_payload(project_key, summary, description, _EPIC_ISSUETYPE))
         return response["key"]
 
     def create_story(self, project_key: str, summary: str, description: str, 
                     epic_key: str, story_points: int = None) -> str:
         """Create a story and return its key."""
-        # Get issue types if not already fetched
-        if not self.issue_types:
-            self.issue_types = self._get_project_issue_types(project_key)
-            
-        payload = {
-            "fields": {
-                "project": {
-                    "key": project_key
-                },
-                "summary": summary,
-                "description": self._create_description(description),
-                "issuetype": {
-                    "name": "Story"  # Use name instead of ID
-                },
-                "labels": ["ReqGenie"]
-            }
-        }
+        # Get issue types (cached per project)
+        self._get_project_issue_types(project_key)
         
-        response = self.create_issue(payload)
+        response = self.create_issue(_issue_payload(project_key, summary, description, _STORY_ISSUETYPE))
         return response["key"]
 
     def create_task(self, project_key: str, summary: str, description: str, 
                    parent_key: str) -> str:
-        """Create a task and return its key."""
-        # Get issue types if not already fetched
-        if not self.issue_types:
-            self.issue_types = self._get_project_issue_types(project_key)
-            
-        payload = {
-            "fields": {
-                "project": {
-                    "key": project_key
-                },
-                "summary": summary,
-                "description": self._create_description(description),
-                "issuetype": {
-                    "name": "Task"  # Use name instead of ID
-                },
-                "labels": ["ReqGenie"]
-            }
-        }
-        
-        # Create the task first
-        response = self.create_issue(payload)
-        task_key = response["key"]
+        """Create a task linked to its parent story and return its key."""
+        # Get issue types (cached per project)
+        self._get_project_issue_types(project_key)
         
-        # Create a link to the parent story
-        self.create_link(task_key, parent_key, "Relates")
-        
-        return task_key
+        response = self.create_issue(_task_payload(project_key, summary, description, parent_key))
+        return response["key"]
 
     def create_link(self, outward_key: str, inward_key: str, link_type: str = "Relates") -> None:
         """Create a link between two issues."""
         url = f"{self.base_url}/rest/api/3/issueLink"
-        
-        payload = {
-            "outwardIssue": {"key": outward_key},
-            "inwardIssue": {"key": inward_key},
-            "type": {"name": link_type}
-        }
-        
-        response = requests.post(
-            url,
-            data=json.dumps(payload),
-            headers=self.headers,
-            auth=self.auth
-        )
-        response.raise_for_status()
\ No newline at end of file
+        response = self.session.post(url, json=_link_payload(outward_key, inward_key, link_type), timeout=30)
+        response.raise_for_status()
@@ -0,0 +1,122 @@
+"""Persistent cache for agent responses.
+
+Re-running the same requirement through the same agent returns the stored
+response instead of paying for another LLM call. Set
+REQGENIE_RESPONSE_CACHE=0 to always call the model.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Generator, List, Optional
+
+from swarm import Agent, Swarm
+
+RESPONSE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "reqgenie", "responses.sqlite")
+# Entries expire and the oldest are evicted past the cap, so the cache stays bounded
+# on hosts whose writable filesystem is held in memory (e.g. Cloud Run)
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+class ResponseCache:
+    def __init__(self, path: str = RESPONSE_CACHE_PATH,
+                 ttl: float = RESPONSE_CACHE_TTL_SECONDS,
+                 max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Streamlit serves sessions from several threads, so share one connection behind a lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS agent_responses "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(agent: Agent, messages: List[Dict[str, str]]) -> str:
+        """Key a request by agent name, model, instructions and the exact messages."""
+        # Messages are keyed verbatim: prompts embed code, where whitespace is significant
+        payload = json.dumps([agent.name, agent.model, agent.instructions, messages])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM agent_responses WHERE key = ? AND created_at > ?",
+                (key, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, content: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO agent_responses (key, content, created_at) VALUES (?, ?, ?)",
+                (key, content, now)
+            )
+            # Expire stale entries and evict the oldest beyond the cap
+            self._conn.execute("DELETE FROM agent_responses WHERE created_at <= ?", (now - self.ttl,))
+            self._conn.execute(
+                "DELETE FROM agent_responses WHERE key NOT IN "
+                "(SELECT key FROM agent_responses ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+
+_cache: Optional[ResponseCache] = None
+# The diagram agent runs on a background thread, so guard creating the shared cache
+_cache_lock = threading.Lock()
+
+def _get_cache() -> Optional[ResponseCache]:
+    """Return the shared cache, or None when caching is disabled."""
+    global _cache
+    if os.getenv("REQGENIE_RESPONSE_CACHE", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
+
+def cached_run(client: Swarm, agent: Agent, messages: List[Dict[str, str]],
+               store: bool = True) -> Generator:
+    """
+    Stream an agent response, serving exact repeats from the cache.
+
+    A cache hit yields the stored response as a single content chunk. A miss
+    streams from the model as usual and stores the response once the stream
+    has been fully consumed. Callers that parse or validate the response pass
+    store=False and call store_response once the response has been accepted,
+    so a rejected reply is never replayed.
+    """
+    cache = _get_cache()
+    if cache is None:
+        yield from client.run(agent=agent, messages=messages, stream=True)
+        return
+
+    key = cache.make_key(agent, messages)
+    cached = cache.get(key)
+    if cached is not None:
+        yield {"content": cached}
+        return
+
+    full_response = []
+    for chunk in client.run(agent=agent, messages=messages, stream=True):
+        content = chunk.get("content") if isinstance(chunk, dict) else chunk
+        if content:
+            full_response.append(content)
+        yield chunk
+
+    if store and full_response:
+        cache.set(key, "".join(full_response))
+
+def store_response(agent: Agent, messages: List[Dict[str, str]], content: str) -> None:
+    """Store a response the caller has accepted, for use with cached_run(store=False)."""
+    cache = _get_cache()
+    if cache is not None and content:
+        cache.set(cache.make_key(agent, messages), content)
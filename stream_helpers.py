@@ -0,0 +1,41 @@
+"""Render streamed agent responses into Streamlit placeholders."""
+import time
+
+import streamlit as st
+
+# Re-render a streaming placeholder once this much new text or time has accumulated
+STREAM_FLUSH_CHARS = 128
+STREAM_FLUSH_SECONDS = 0.05
+
+def stream_to_placeholder(stream, placeholder, prefix: str = "") -> str:
+    """
+    Render an agent stream into a placeholder and return the complete response.
+
+    Re-joining and re-rendering on every delta makes long responses quadratic
+    and floods the browser with updates, so the placeholder is only refreshed
+    once enough new text or time has accumulated, plus a final render when
+    the stream ends. The prefix is shown before the text but not returned.
+    """
+    full_response = []
+    unflushed = 0
+    last_flush = time.monotonic()
+
+    def render():
+        try:
+            placeholder.markdown(prefix + ''.join(full_response))
+        except Exception as e:
+            st.error(f"Streaming error: {str(e)}")
+
+    for chunk in stream:
+        content = chunk.get("content") if isinstance(chunk, dict) else chunk
+        if isinstance(content, str) and content:
+            full_response.append(content)
+            unflushed += len(content)
+            now = time.monotonic()
+            if unflushed >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_SECONDS:
+                render()
+                unflushed = 0
+                last_flush = now
+
+    render()
+    return ''.join(full_response)